@@ -10,7 +10,7 @@ Features
 - Supports uploading custom Python algorithms (.py / .zip) and wraps them
 
 Architecture
-- In-memory session store `PLAY` with TTL-based GC
+- In-memory LRU session store `PLAY` with a size cap and background TTL GC
 - Two envs: Bernoulli and Gaussian (both seeded)
 - Built-in algorithms: Greedy, ε-Greedy, UCB1, Thompson Sampling
 - Custom algos loaded by function name from uploaded module (default `run`)
@@ -25,11 +25,31 @@ import uuid
 import shutil
 import zipfile
 import hashlib
-import random
+import hmac
+import ntpath
+import gzip
+import mimetypes
+import asyncio
+import functools
+from collections import OrderedDict
 from typing import List, Dict, Literal, Optional
-from dataclasses import dataclass
-
-from quart import Quart, jsonify, request, send_from_directory, redirect
+from array import array
+from dataclasses import dataclass, field
+
+import numpy as np
+import orjson
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional: run_batch() then steps the Python select/update path
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+from quart import Quart, Response, jsonify, request, send_from_directory, redirect
+from quart.json.provider import DefaultJSONProvider
 from quart_cors import cors
 from pydantic import BaseModel, Field, ValidationError
 import importlib.util
@@ -78,161 +98,421 @@ os.makedirs(ALGO_DIR, exist_ok=True)
 # -----------------------------------------------------------------------------
 
 class BanditEnvBase:
-    """Base class. Subclasses implement `reset()`, `step()` and `info()`.
-
-    - Keeps a `random.Random` seeded RNG for reproducibility
-    - `info()` returns a JSON-serializable dict with parameters
+    """Base class. Subclasses implement `reset()`, `step()`, `step_batch()` and `info()`.
+
+    - Keeps a seeded `numpy.random.Generator` (PCG64) for reproducibility; it
+      serves bulk draws (`sample_rewards()`) and the buffered per-step noise
+      consumed by `step()`
+    - `info()` returns a JSON-serializable dict with parameters; `info_bytes()`
+      is the same payload serialized once at `reset()`
+    - `kind` names the env type without building the `info()` payload
+    - `PARAMS` names the (read-only) parameter arrays drawn by `reset()`
     """
+    kind: str = "base"
+    PARAMS: tuple[str, ...] = ()
+    NOISE_BUFFER = 256  # per-step draws pre-generated per refill (play sessions are short)
 
     def __init__(self, n_actions: int, seed: Optional[int] = None):
         self.n_actions = n_actions
-        self._rng = random.Random(seed)
+        self._rng = np.random.default_rng(seed)
+        self._noise = np.empty(0)
+        self._noise_pos = 0
         self.reset()
 
     def reset(self) -> None:
-        pass
+        self._freeze_params()
+
+    def _freeze_params(self) -> None:
+        """Lock the parameter arrays and cache their serialized `info()`."""
+        for name in self.PARAMS:
+            getattr(self, name).flags.writeable = False
+        self._info_json = orjson.dumps(self.info())
+
+    def info_bytes(self) -> bytes:
+        return self._info_json
+
+    def reseeded(self, seed: Optional[int]) -> "BanditEnvBase":
+        """Same arm parameters, fresh RNG stream seeded with `seed`."""
+        env = type(self)(self.n_actions, seed=seed)
+        for name in self.PARAMS:
+            setattr(env, name, getattr(self, name))  # read-only, safe to share
+        env._info_json = self._info_json
+        return env
 
     def step(self, action: int) -> float:
         raise NotImplementedError
 
+    def step_batch(self, action: int, n: int) -> np.ndarray:
+        """`n` float64 rewards for repeatedly pulling `action`, drawn in one call."""
+        raise NotImplementedError
+
+    def sample_rewards(self, iterations: int) -> np.ndarray:
+        """Pre-sample a reward table of shape (iterations, n_actions) for batch runs.
+
+        Any real or integer dtype; consumers read entries as float rewards.
+        """
+        raise NotImplementedError
+
+    def _draw_noise(self, n: int) -> np.ndarray:
+        """Draw `n` base variates (uniform / standard normal) from the NumPy generator."""
+        raise NotImplementedError
+
+    def _next_noise(self) -> float:
+        """Next base variate for an online step, refilled in bulk when exhausted."""
+        if self._noise_pos >= len(self._noise):
+            self._noise = self._draw_noise(self.NOISE_BUFFER)
+            self._noise_pos = 0
+        v = self._noise.item(self._noise_pos)
+        self._noise_pos += 1
+        return v
+
     def info(self) -> dict:
         return {"n_actions": self.n_actions}
 
 
 class BernoulliBanditEnv(BanditEnvBase):
     """Bernoulli arms with per-action success probabilities p[i] ∈ [0.1, 0.9]."""
+    kind = "bernoulli"
+    PARAMS = ("p",)
 
     def reset(self) -> None:
-        self.p = [self._rng.uniform(0.1, 0.9) for _ in range(self.n_actions)]
+        self.p = self._rng.uniform(0.1, 0.9, size=self.n_actions)
+        self._freeze_params()
 
     def step(self, action: int) -> float:
-        return 1.0 if self._rng.random() < self.p[action] else 0.0
+        return 1.0 if self._next_noise() < self.p[action] else 0.0
+
+    def step_batch(self, action: int, n: int) -> np.ndarray:
+        return (self._draw_noise(n) < self.p[action]).astype(np.float64)
+
+    def sample_rewards(self, iterations: int) -> np.ndarray:
+        # one uniform per step, compared against every arm's p; stored as 0/1 bytes
+        # (8x smaller than float64, so large tables stay cache-friendly)
+        u = self._draw_noise(iterations)
+        return (u[:, None] < self.p).view(np.uint8)
+
+    def _draw_noise(self, n: int) -> np.ndarray:
+        return self._rng.random(n)
 
     def info(self) -> dict:
         base = super().info()
-        base.update({"type": "bernoulli", "p": self.p})
+        base.update({"type": self.kind, "p": self.p.tolist()})
         return base
 
 
 class GaussianBanditEnv(BanditEnvBase):
     """Gaussian arms with per-action mean μ ∈ [-1,1] and σ ∈ [0.1,1.0]."""
+    kind = "gaussian"
+    PARAMS = ("means", "stds")
 
     def reset(self) -> None:
-        self.means = [self._rng.uniform(-1.0, 1.0) for _ in range(self.n_actions)]
-        self.stds = [self._rng.uniform(0.1, 1.0) for _ in range(self.n_actions)]
+        self.means = self._rng.uniform(-1.0, 1.0, size=self.n_actions)
+        self.stds = self._rng.uniform(0.1, 1.0, size=self.n_actions)
+        self._freeze_params()
 
     def step(self, action: int) -> float:
-        return self._rng.gauss(self.means[action], self.stds[action])
+        return float(self.means[action] + self.stds[action] * self._next_noise())
+
+    def step_batch(self, action: int, n: int) -> np.ndarray:
+        return self.means[action] + self.stds[action] * self._draw_noise(n)
+
+    def sample_rewards(self, iterations: int) -> np.ndarray:
+        # one standard normal per step, scaled per arm (means + stds * z)
+        z = self._draw_noise(iterations)
+        return self.means + self.stds * z[:, None]
+
+    def _draw_noise(self, n: int) -> np.ndarray:
+        return self._rng.standard_normal(n)
 
     def info(self) -> dict:
         base = super().info()
-        base.update({"type": "gaussian", "means": self.means, "stds": self.stds})
+        base.update({"type": self.kind, "means": self.means.tolist(), "stds": self.stds.tolist()})
         return base
 
+# -----------------------------------------------------------------------------
+# Numba kernels — compiled per-algorithm simulation loops for /api/plot
+# -----------------------------------------------------------------------------
+
+# Frozen (PyInstaller) builds ship no .py sources next to the binary, which
+# numba's on-disk cache needs; JIT per process there instead.
+# Kernels release the GIL so /api/plot can run one per worker thread.
+_NUMBA_CACHE = not getattr(sys, "frozen", False)
+
+
+@njit(cache=_NUMBA_CACHE, nogil=True)
+def _argmax_tiebreak(values):
+    """Index of the max value; ties broken uniformly at random in one pass."""
+    best = values[0]
+    idx = 0
+    ties = 1
+    for i in range(1, values.shape[0]):
+        v = values[i]
+        if v > best:
+            best = v
+            idx = i
+            ties = 1
+        elif v == best:
+            ties += 1
+            if np.random.random() * ties < 1.0:
+                idx = i
+    return idx
+
+
+@njit(cache=_NUMBA_CACHE, nogil=True)
+def _greedy_run(table, q, counts, seed):
+    np.random.seed(seed)
+    iterations = table.shape[0]
+    actions = np.empty(iterations, dtype=np.int64)
+    rewards = np.empty(iterations, dtype=np.float64)
+    for t in range(iterations):
+        a = _argmax_tiebreak(q)
+        r = table[t, a]
+        counts[a] += 1
+        q[a] += (r - q[a]) / counts[a]
+        actions[t] = a
+        rewards[t] = r
+    return actions, rewards
+
+
+@njit(cache=_NUMBA_CACHE, nogil=True)
+def _epsilon_greedy_run(table, q, counts, epsilon, seed):
+    np.random.seed(seed)
+    iterations, n_actions = table.shape
+    actions = np.empty(iterations, dtype=np.int64)
+    rewards = np.empty(iterations, dtype=np.float64)
+    # explore coin flips and explore arms for the whole run, drawn up front
+    explore = np.random.random(iterations) < epsilon
+    explore_actions = np.random.randint(0, n_actions, iterations)
+    for t in range(iterations):
+        if explore[t]:
+            a = explore_actions[t]
+        else:
+            a = _argmax_tiebreak(q)
+        r = table[t, a]
+        counts[a] += 1
+        q[a] += (r - q[a]) / counts[a]
+        actions[t] = a
+        rewards[t] = r
+    return actions, rewards
+
+
+@njit(cache=_NUMBA_CACHE, nogil=True)
+def _ucb1_run(table, q, counts, inv_sqrt_counts, total_steps, next_untried, seed):
+    np.random.seed(seed)
+    iterations, n_actions = table.shape
+    actions = np.empty(iterations, dtype=np.int64)
+    rewards = np.empty(iterations, dtype=np.float64)
+    ucb = np.empty(n_actions, dtype=np.float64)
+    # sqrt(2 ln t) for every step of the run, precomputed in one vectorized pass
+    bonus = np.sqrt(2.0 * np.log(np.arange(total_steps + 1, total_steps + iterations + 1).astype(np.float64)))
+    for t in range(iterations):
+        # Try each arm once (in order) before using confidence bounds; counts only
+        # grow, so the cursor never moves back and the scan is O(n_actions) per run
+        while next_untried < n_actions and counts[next_untried] > 0:
+            next_untried += 1
+        if next_untried < n_actions:
+            a = next_untried
+        else:
+            b = bonus[t]
+            for i in range(n_actions):
+                ucb[i] = q[i] + b * inv_sqrt_counts[i]
+            a = _argmax_tiebreak(ucb)
+        r = table[t, a]
+        counts[a] += 1
+        q[a] += (r - q[a]) / counts[a]
+        inv_sqrt_counts[a] = 1.0 / np.sqrt(counts[a])
+        actions[t] = a
+        rewards[t] = r
+    return actions, rewards, next_untried
+
+
+@njit(cache=_NUMBA_CACHE, nogil=True)
+def _thompson_run(table, successes, failures, seed):
+    np.random.seed(seed)
+    iterations, n_actions = table.shape
+    actions = np.empty(iterations, dtype=np.int64)
+    rewards = np.empty(iterations, dtype=np.float64)
+    samples = np.empty(n_actions, dtype=np.float64)
+    for t in range(iterations):
+        for i in range(n_actions):
+            samples[i] = np.random.beta(float(successes[i]), float(failures[i]))
+        a = _argmax_tiebreak(samples)
+        r = table[t, a]
+        if r == 1.0:
+            successes[a] += 1
+        else:
+            failures[a] += 1
+        actions[t] = a
+        rewards[t] = r
+    return actions, rewards
+
 # -----------------------------------------------------------------------------
 # Algorithms — built-ins and a thin wrapper for custom upload
 # -----------------------------------------------------------------------------
 
+# Unseeded algorithms draw from one process-wide generator instead of building their own
+_SHARED_RNG = np.random.default_rng()
+
+
+def _random_argmax(values, rng: np.random.Generator) -> int:
+    """Index of the max of `values`, ties broken uniformly with `rng`."""
+    values = np.asarray(values)
+    candidates = np.flatnonzero(values == values.max())
+    if candidates.size == 1:
+        return int(candidates[0])
+    return int(candidates[rng.integers(0, candidates.size)])
+
+
 class AlgorithmBase:
-    """Base policy: override select_action() and update()."""
+    """Base policy: override select_action() and update().
+
+    Algorithms are allocated per plot request, so they declare `__slots__`.
+    """
     name: str = "AlgorithmBase"
+    __slots__ = ("n_actions", "_rng")
 
-    def __init__(self, n_actions: int, seed: Optional[int] = None):
+    def __init__(self, n_actions: int, seed: int | np.random.SeedSequence | None = None):
         self.n_actions = n_actions
-        self._rng = random.Random(seed)
+        self._rng = _SHARED_RNG if seed is None else np.random.default_rng(seed)
 
     def select_action(self) -> int:
         # Placeholder: random / ε=1 policy
-        return self._rng.randrange(self.n_actions)
+        return int(self._rng.integers(0, self.n_actions))
 
     def update(self, action: int, reward: float) -> None:
         pass
 
+    def simulate_batch(self, env: BanditEnvBase, iterations: int) -> tuple[np.ndarray, np.ndarray]:
+        """Run `iterations` steps against a pre-sampled reward table of `env`.
+
+        Avoids one env RNG call per step; each step is a table lookup.
+        Returns (actions, rewards) as NumPy arrays.
+        """
+        return self.run_batch(env.sample_rewards(iterations))
+
+    def run_batch(self, table: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Replay a reward table of shape (iterations, n_actions); see simulate_batch().
+
+        Built-ins override `_run_kernel()` with a compiled loop. Without numba those
+        kernels would run as plain Python on NumPy's global RandomState (shared across
+        the plot's threads), so the step loop on the instance's own Generator runs instead.
+        """
+        if HAVE_NUMBA and type(self)._run_kernel is not AlgorithmBase._run_kernel:
+            return self._run_kernel(table)
+        iterations = table.shape[0]
+        actions = np.empty(iterations, dtype=np.int64)
+        rewards = np.empty(iterations, dtype=np.float64)
+        for t in range(iterations):
+            a = self.select_action()
+            r = table[t, a]
+            self.update(a, r)
+            actions[t] = a
+            rewards[t] = r
+        return actions, rewards
+
+    def _run_kernel(self, table: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError
+
 
 class Greedy(AlgorithmBase):
     name = "Greedy"
+    __slots__ = ("q_values", "counts")
 
     def __init__(self, n_actions: int, seed: Optional[int] = None):
         super().__init__(n_actions, seed)
-        self.q_values = [0.0] * n_actions
-        self.counts = [0] * n_actions
+        self.q_values = np.zeros(n_actions, dtype=np.float64)
+        self.counts = np.zeros(n_actions, dtype=np.int64)
 
     def select_action(self) -> int:
-        max_q = max(self.q_values)
-        candidates = [i for i, q in enumerate(self.q_values) if q == max_q]
-        return self._rng.choice(candidates)
+        return _random_argmax(self.q_values, self._rng)
 
     def update(self, action: int, reward: float) -> None:
         self.counts[action] += 1
         n = self.counts[action]
         self.q_values[action] += (reward - self.q_values[action]) / n
 
+    def _run_kernel(self, table: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return _greedy_run(table, self.q_values, self.counts, int(self._rng.integers(2**32)))
+
 
 class EpsilonGreedy(AlgorithmBase):
     name = "Epsilon-Greedy"
+    __slots__ = ("epsilon", "q_values", "counts")
 
     def __init__(self, n_actions: int, seed: Optional[int] = None, epsilon: float = 0.1):
         super().__init__(n_actions, seed)
         self.epsilon = epsilon
-        self.q_values = [0.0] * n_actions
-        self.counts = [0] * n_actions
+        self.q_values = np.zeros(n_actions, dtype=np.float64)
+        self.counts = np.zeros(n_actions, dtype=np.int64)
 
     def select_action(self) -> int:
         if self._rng.random() < self.epsilon:
-            return self._rng.randrange(self.n_actions)
-        max_q = max(self.q_values)
-        candidates = [i for i, q in enumerate(self.q_values) if q == max_q]
-        return self._rng.choice(candidates)
+            return int(self._rng.integers(0, self.n_actions))
+        return _random_argmax(self.q_values, self._rng)
 
     def update(self, action: int, reward: float) -> None:
         self.counts[action] += 1
         n = self.counts[action]
         self.q_values[action] += (reward - self.q_values[action]) / n
 
+    def _run_kernel(self, table: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return _epsilon_greedy_run(table, self.q_values, self.counts, self.epsilon, int(self._rng.integers(2**32)))
+
 
 class UCB1(AlgorithmBase):
     name = "UCB1"
+    __slots__ = ("q_values", "counts", "total_steps", "_inv_sqrt_counts", "_next_untried")
 
     def __init__(self, n_actions: int, seed: Optional[int] = None):
         super().__init__(n_actions, seed)
-        self.q_values = [0.0] * n_actions
-        self.counts = [0] * n_actions
+        self.q_values = np.zeros(n_actions, dtype=np.float64)
+        self.counts = np.zeros(n_actions, dtype=np.int64)
         self.total_steps = 0
+        # 1/sqrt(counts[i]), maintained per pulled arm so log/sqrt aren't redone K times a step
+        self._inv_sqrt_counts = np.zeros(n_actions, dtype=np.float64)
+        # counts only grow, so the lowest untried arm index never moves backwards
+        self._next_untried = 0
 
     def select_action(self) -> int:
         self.total_steps += 1
-        # Try each arm once
-        for i in range(self.n_actions):
-            if self.counts[i] == 0:
-                return i
-        ucb_values = [
-            self.q_values[i] + math.sqrt(2.0 * math.log(self.total_steps) / self.counts[i])
-            for i in range(self.n_actions)
-        ]
-        max_ucb = max(ucb_values)
-        candidates = [i for i, val in enumerate(ucb_values) if val == max_ucb]
-        return self._rng.choice(candidates)
+        # Try each arm once, lowest index first (amortized O(1) over the run)
+        i = self._next_untried
+        while i < self.n_actions and self.counts[i] > 0:
+            i += 1
+        self._next_untried = i
+        if i < self.n_actions:
+            return i
+        bonus = math.sqrt(2.0 * math.log(self.total_steps))
+        return _random_argmax(self.q_values + bonus * self._inv_sqrt_counts, self._rng)
 
     def update(self, action: int, reward: float) -> None:
         self.counts[action] += 1
         n = self.counts[action]
         self.q_values[action] += (reward - self.q_values[action]) / n
+        self._inv_sqrt_counts[action] = 1.0 / math.sqrt(n)
+
+    def _run_kernel(self, table: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        actions, rewards, self._next_untried = _ucb1_run(
+            table, self.q_values, self.counts, self._inv_sqrt_counts, self.total_steps, self._next_untried,
+            int(self._rng.integers(2**32)),
+        )
+        self.total_steps += table.shape[0]
+        return actions, rewards
 
 
 class ThompsonSampling(AlgorithmBase):
     name = "Thompson Sampling"
+    __slots__ = ("successes", "failures")
 
     def __init__(self, n_actions: int, seed: Optional[int] = None):
         super().__init__(n_actions, seed)
         # Beta(1,1) priors (uniform) for Bernoulli rewards
-        self.successes = [1] * n_actions
-        self.failures = [1] * n_actions
+        self.successes = np.ones(n_actions, dtype=np.int64)
+        self.failures = np.ones(n_actions, dtype=np.int64)
 
     def select_action(self) -> int:
-        samples = [self._rng.betavariate(self.successes[i], self.failures[i]) for i in range(self.n_actions)]
-        max_sample = max(samples)
-        candidates = [i for i, s in enumerate(samples) if s == max_sample]
-        return self._rng.choice(candidates)
+        # one vectorized Beta draw for all arms
+        return _random_argmax(self._rng.beta(self.successes, self.failures), self._rng)
 
     def update(self, action: int, reward: float) -> None:
         if reward == 1:
@@ -240,6 +520,9 @@ class ThompsonSampling(AlgorithmBase):
         else:
             self.failures[action] += 1
 
+    def _run_kernel(self, table: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return _thompson_run(table, self.successes, self.failures, int(self._rng.integers(2**32)))
+
 
 ALGOS = {
     "greedy": Greedy,
@@ -248,26 +531,42 @@ ALGOS = {
     "thompson": ThompsonSampling,
 }
 
+
+def warm_kernels() -> None:
+    """Compile (or load from numba's cache) every built-in kernel ahead of the first plot.
+
+    /api/plot hands kernels read-only tables, float64 (Gaussian) or uint8 (Bernoulli),
+    and numba specializes per dtype and writability, so warm exactly those.
+    """
+    if not HAVE_NUMBA:
+        return
+    for dtype in (np.float64, np.uint8):
+        table = np.zeros((2, 2), dtype=dtype)
+        table.flags.writeable = False
+        for cls in ALGOS.values():
+            cls(2, seed=0).run_batch(table)
+
 # -----------------------------------------------------------------------------
 # API models and session store
 # -----------------------------------------------------------------------------
 
 EnvType = Literal["bernoulli", "gaussian"]
+AlgoKey = Literal[tuple(ALGOS)]
 
 class RunRequest(BaseModel):
     env: EnvType
     n_actions: int = Field(ge=2, le=100)
     iterations: int = Field(ge=1, le=50_000)
-    algorithms: List[str] = Field(default_factory=lambda: ["greedy", "epsilon_greedy"], min_items=1)
-    seed: Optional[int] = None
-    custom_algorithms: Optional[List[str]] = None
+    algorithms: List[AlgoKey] = Field(default_factory=lambda: ["greedy", "epsilon_greedy"], min_items=1, max_items=32)
+    seed: Optional[int] = Field(None, ge=0)  # numpy seeds must be non-negative
+    custom_algorithms: Optional[List[str]] = Field(None, max_items=32)
 
 class PlayStartReq(BaseModel):
     env: EnvType
     n_actions: int = Field(ge=2, le=100)
     iterations: int = Field(ge=1, le=10_000)
-    algorithms: List[str] = Field(default_factory=lambda: ["greedy", "epsilon_greedy"], min_items=1)
-    seed: Optional[int] = None
+    algorithms: List[AlgoKey] = Field(default_factory=lambda: ["greedy", "epsilon_greedy"], min_items=1)
+    seed: Optional[int] = Field(None, ge=0)  # numpy seeds must be non-negative
 
 class PlayStepReq(BaseModel):
     session_id: str
@@ -278,33 +577,77 @@ class PlaySessionReq(BaseModel):
 
 class PlotReq(BaseModel):
     session_id: str
-    algorithms: List[str] = Field(default_factory=list)
-    custom_algorithms: Optional[List[str]] = None
-    iterations: Optional[int] = None  # default: use session.iterations
+    algorithms: List[AlgoKey] = Field(default_factory=list, max_items=32)
+    custom_algorithms: Optional[List[str]] = Field(None, max_items=32)
+    iterations: Optional[int] = Field(None, ge=1, le=50_000)  # default: use session.iterations
 
 class PlayResetReq(BaseModel):
     session_id: str
 
-@dataclass
+@dataclass(slots=True)
 class PlaySession:
     id: str
     env: BanditEnvBase          # fixed env instance with p / means, stds
     iterations: int
     t: int
-    history: list[dict]         # [{t, action, reward, accepted?}]
     last_access: float
-    seed: Optional[int] = None
+    seed: Optional[int] = Field(None, ge=0)  # numpy seeds must be non-negative
+    # History as typed columns (entry i is step t=i+1); `accepted` is derived from the reward
+    actions: array = field(default_factory=lambda: array("q"))
+    rewards: array = field(default_factory=lambda: array("d"))
+
+    def history_rows(self) -> list[dict]:
+        """[{t, action, reward, accepted?}], built only when a client asks for the log."""
+        steps = zip(range(1, len(self.actions) + 1), self.actions, self.rewards)
+        if self.env.kind == "bernoulli":
+            return [{"t": t, "action": a, "reward": r, "accepted": r >= 1.0} for t, a, r in steps]
+        return [{"t": t, "action": a, "reward": r} for t, a, r in steps]
+
+    def history_columns(self) -> dict:
+        """{t: [...], action: [...], reward: [...], accepted?: [...]} as NumPy arrays.
+
+        Copied (a memcpy) rather than viewed: an exported buffer would block later appends.
+        """
+        rewards = np.frombuffer(self.rewards, dtype=np.float64).copy()
+        cols = {
+            "t": np.arange(1, len(self.actions) + 1),
+            "action": np.frombuffer(self.actions, dtype=np.int64).copy(),
+            "reward": rewards,
+        }
+        if self.env.kind == "bernoulli":
+            cols["accepted"] = rewards >= 1.0
+        return cols
 
-PLAY: dict[str, PlaySession] = {}
+# Ordered by last access (oldest first): every access goes through _touch()
+PLAY: OrderedDict[str, PlaySession] = OrderedDict()
 PLAY_TTL = 30 * 60  # 30 minutes
+PLAY_MAX_SESSIONS = 1000
+PLAY_GC_INTERVAL = 60  # seconds between background GC passes
+
+
+def _touch(sid: str) -> PlaySession | None:
+    """Look up a session and mark it as most recently used."""
+    s = PLAY.get(sid)
+    if s:
+        s.last_access = time.time()
+        PLAY.move_to_end(sid)
+    return s
 
 
 def _gc(now: float | None = None):
-    """Garbage-collect expired sessions by last_access timestamp."""
+    """Garbage-collect expired sessions; stops at the first live one (LRU order)."""
     now = now or time.time()
-    dead = [sid for sid, s in PLAY.items() if now - s.last_access > PLAY_TTL]
-    for sid in dead:
-        PLAY.pop(sid, None)
+    while PLAY:
+        sid, s = next(iter(PLAY.items()))
+        if now - s.last_access <= PLAY_TTL:
+            break
+        PLAY.popitem(last=False)
+
+
+async def _gc_loop():
+    while True:
+        await asyncio.sleep(PLAY_GC_INTERVAL)
+        _gc()
 
 # -----------------------------------------------------------------------------
 # Frontend serving (dev vs prod)
@@ -316,9 +659,117 @@ VITE_URL = os.environ.get("VITE_URL", "http://localhost:5173")
 IS_DEV = os.environ.get("VITE_DEV", "1") == "0"
 VITE_URL = os.environ.get("VITE_URL", "http://localhost:5173")
 
+IMMUTABLE_EXTS = (".js", ".css", ".png", ".jpg", ".jpeg", ".svg", ".ico", ".woff", ".woff2")
+
+
+def index_static_etags(root: Optional[str]) -> Dict[str, str]:
+    """Map every file under `root` ("/"-separated relpath) to a content-hash ETag.
+
+    Built once at startup: the bundle is immutable while the server runs.
+    """
+    etags: Dict[str, str] = {}
+    if not root:
+        return etags
+    for dirpath, _dirs, files in os.walk(root):
+        for name in files:
+            full = os.path.join(dirpath, name)
+            rel = os.path.relpath(full, root).replace(os.sep, "/")
+            with open(full, "rb", buffering=0) as f:
+                etags[rel] = hashlib.file_digest(f, "sha1").hexdigest()
+    return etags
+
+
+GZIP_EXTS = (".js", ".css", ".html", ".svg", ".json", ".map", ".txt")
+GZIP_MIN_BYTES = 1024
+
+
+def precompress_static(root: Optional[str], paths) -> Dict[str, bytes]:
+    """Gzip the compressible files among `paths` once, keeping only those that shrink."""
+    bodies: Dict[str, bytes] = {}
+    if not root:
+        return bodies
+    for rel in paths:
+        if not rel.endswith(GZIP_EXTS):
+            continue
+        with open(os.path.join(root, rel), "rb") as f:
+            raw = f.read()
+        if len(raw) < GZIP_MIN_BYTES:
+            continue
+        packed = gzip.compress(raw, compresslevel=9, mtime=0)
+        if len(packed) < len(raw):
+            bodies[rel] = packed
+    return bodies
+
+
+STATIC_ETAGS = index_static_etags(FRONTEND_DIR)
+STATIC_GZIP = precompress_static(FRONTEND_DIR, STATIC_ETAGS)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """`jsonify` / `app.json` backed by orjson (NumPy arrays serialize natively)."""
+    OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, object_, **kwargs) -> str:
+        option = self.OPTIONS | (orjson.OPT_INDENT_2 if kwargs.get("indent") else 0)
+        return orjson.dumps(object_, default=self.default, option=option).decode()
+
+    def dumpb(self, object_) -> bytes:
+        """Serialize to response-body bytes (pre-serialized `orjson.Fragment`s pass through)."""
+        return orjson.dumps(object_, default=self.default, option=self.OPTIONS)
+
+    def loads(self, object_, **kwargs):
+        return orjson.loads(object_)
+
+    def response(self, *args, **kwargs) -> Response:
+        # same argument rules as jsonify(); bytes go straight into the body (no str round-trip)
+        if args and kwargs:
+            raise TypeError("jsonify() behavior undefined when passed both args and kwargs")
+        obj = kwargs or (args[0] if len(args) == 1 else list(args) if args else None)
+        return self.body_response(self.dumpb(obj))
+
+    def body_response(self, body: bytes) -> Response:
+        """Response for a body from `dumpb`, e.g. one kept in a cache."""
+        return Response(body, mimetype=self.mimetype)
+
 
 app = cors(Quart(__name__), allow_origin="*", allow_headers="*", allow_methods=["GET", "POST", "OPTIONS"])
 app.config["PROVIDE_AUTOMATIC_OPTIONS"] = True
+app.json = OrjsonProvider(app)
+
+
+@app.before_serving
+async def _start_gc():
+    app.config["PLAY_GC_TASK"] = asyncio.create_task(_gc_loop())
+
+
+def _report_warm_up(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        print(f"[warmup] kernel compilation failed: {task.exception()!r}", file=sys.stderr)
+
+
+@app.before_serving
+async def _warm_up():
+    # JIT in the background so the first /api/plot doesn't pay for it; BANDIT_NUMBA_WARMUP=0 skips
+    if os.environ.get("BANDIT_NUMBA_WARMUP", "1") != "0":
+        task = asyncio.create_task(asyncio.to_thread(warm_kernels))
+        task.add_done_callback(_report_warm_up)
+        app.config["KERNEL_WARMUP_TASK"] = task
+
+
+@app.after_serving
+async def _stop_gc():
+    task = app.config.pop("PLAY_GC_TASK", None)
+    if task:
+        task.cancel()
+
+
+@app.after_serving
+async def _stop_warm_up():
+    task = app.config.pop("KERNEL_WARMUP_TASK", None)
+    if task:
+        # the worker thread finishes its current compile regardless; don't block shutdown on it
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
 
 
 @app.route("/", defaults={"path": ""})
@@ -327,7 +778,8 @@ async def serve_frontend(path: str):
     """Serve React app.
 
     - DEV: redirect to Vite for HMR
-    - PROD: serve from resolved FRONTEND_DIR with long cache for static assets
+    - PROD: serve from resolved FRONTEND_DIR with long cache for static assets,
+      content ETags and pre-gzipped bodies for clients that accept gzip
     """
     if IS_DEV:
         to = f"{VITE_URL}/{path}" if path else f"{VITE_URL}/"
@@ -336,10 +788,24 @@ async def serve_frontend(path: str):
     if not FRONTEND_DIR:
         return "Frontend fehlt. Gesucht in _MEIPASS, neben der Binary und neben app.py.", 500
 
-    full = os.path.join(FRONTEND_DIR, path)
-    if path and os.path.isfile(full):
-        resp = await send_from_directory(FRONTEND_DIR, path)
-        if any(path.endswith(ext) for ext in (".js", ".css", ".png", ".jpg", ".jpeg", ".svg", ".ico", ".woff", ".woff2")):
+    # STATIC_ETAGS doubles as the file index: a dict lookup instead of a stat per request
+    etag = STATIC_ETAGS.get(path)
+    if etag is not None:
+        gz = STATIC_GZIP.get(path) if request.accept_encodings["gzip"] else None
+        if gz is not None:
+            etag += "-gz"  # distinct representation, distinct validator
+        if request.if_none_match.contains(etag):
+            # Revalidation hit: answer without opening the file
+            resp = Response("", status=304)
+        elif gz is not None:
+            resp = Response(gz, content_type=mimetypes.guess_type(path)[0] or "application/octet-stream")
+            resp.headers["Content-Encoding"] = "gzip"
+        else:
+            resp = await send_from_directory(FRONTEND_DIR, path)
+        resp.set_etag(etag)
+        if path in STATIC_GZIP:
+            resp.headers["Vary"] = "Accept-Encoding"
+        if path.endswith(IMMUTABLE_EXTS):
             resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
         else:
             resp.headers["Cache-Control"] = "no-cache"
@@ -375,9 +841,10 @@ async def api_play_start():
 
     env = make_env(req.env, req.n_actions, req.seed)
     sid = uuid.uuid4().hex
-    PLAY[sid] = PlaySession(id=sid, env=env, iterations=req.iterations, t=0, history=[], last_access=time.time(), seed=req.seed)
-    _gc()
-    return jsonify({"session_id": sid, "env": env.info(), "t": 0, "iterations": req.iterations})
+    PLAY[sid] = PlaySession(id=sid, env=env, iterations=req.iterations, t=0, last_access=time.time(), seed=req.seed)
+    if len(PLAY) > PLAY_MAX_SESSIONS:
+        PLAY.popitem(last=False)  # evict least recently used
+    return jsonify({"session_id": sid, "env": orjson.Fragment(env.info_bytes()), "t": 0, "iterations": req.iterations})
 
 @app.post("/api/play/step")
 async def api_play_step():
@@ -387,7 +854,7 @@ async def api_play_step():
     except ValidationError as e:
         return jsonify({"error": "invalid payload", "detail": json.loads(e.json())}), 400
 
-    s = PLAY.get(req.session_id)
+    s = _touch(req.session_id)
     if not s:
         return jsonify({"error": "invalid session"}), 404
     if req.action < 0 or req.action >= s.env.n_actions:
@@ -397,21 +864,30 @@ async def api_play_step():
 
     r = s.env.step(int(req.action))
     s.t += 1
-    s.last_access = time.time()
+    s.actions.append(int(req.action))
+    s.rewards.append(float(r))
     ev = {"t": s.t, "action": int(req.action), "reward": float(r)}
-    if s.env.info().get("type") == "bernoulli":
+    if s.env.kind == "bernoulli":
         ev["accepted"] = bool(r >= 1.0)
-    s.history.append(ev)
     return jsonify({**ev, "done": s.t >= s.iterations})
 
 @app.get("/api/play/log")
 async def api_play_log():
+    """Session progress. Pass `include_env=0` to skip the env parameters (O(n_actions));
+    they never change within a session, so /api/play/start's copy stays valid. Pass
+    `format=columns` to get `history` as parallel arrays instead of one object per step."""
     session_id = request.args.get("session_id") or ""
-    s = PLAY.get(session_id)
+    include_env = request.args.get("include_env", "1") != "0"
+    columns = request.args.get("format") == "columns"
+    s = _touch(session_id)
     if not s:
         return jsonify({"error": "invalid session"}), 404
-    s.last_access = time.time()
-    return jsonify({"t": s.t, "iterations": s.iterations, "history": s.history, "env": s.env.info()})
+    return jsonify({
+        "t": s.t,
+        "iterations": s.iterations,
+        "history": s.history_columns() if columns else s.history_rows(),
+        "env": orjson.Fragment(s.env.info_bytes()) if include_env else None,
+    })
 
 @app.post("/api/play/end")
 async def api_play_end():
@@ -421,7 +897,6 @@ async def api_play_end():
     except ValidationError:
         return jsonify({"error": "invalid payload"}), 400
     ok = PLAY.pop(req.session_id, None) is not None
-    _gc()
     return jsonify({"ok": ok})
 
 @app.post("/api/play/reset")
@@ -432,25 +907,26 @@ async def api_play_reset():
     except ValidationError:
         return jsonify({"error": "invalid payload"}), 400
 
-    s = PLAY.get(req.session_id)
+    s = _touch(req.session_id)
     if not s:
         return jsonify({"error": "invalid session"}), 404
 
     # keep the same environment; just clear progress
     s.t = 0
-    s.history = []
-    s.last_access = time.time()
+    del s.actions[:], s.rewards[:]
     return jsonify({"ok": True, "t": 0})
 
 # -----------------------------------------------------------------------------
 # Plot API — batch simulate selected algorithms against the session's env
 # -----------------------------------------------------------------------------
 
-def sha256_file(path: str) -> str:
+def save_and_sha256(stream, path: str, chunk_size: int = 1 << 20) -> str:
+    # hash while copying so the upload passes through memory once instead of save + re-read
     h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
+    with open(path, "wb") as out:
+        while chunk := stream.read(chunk_size):
             h.update(chunk)
+            out.write(chunk)
     return h.hexdigest()
 
 
@@ -467,28 +943,224 @@ def _find_main_py(root: str) -> str | None:
     return None
 
 
+ZIP_MAX_FILE_BYTES = 10 * 1024 * 1024    # per extracted member
+ZIP_MAX_TOTAL_BYTES = 50 * 1024 * 1024   # whole archive, uncompressed
+
+
+def _extract_zip(zip_path: str, out_dir: str) -> None:
+    """Extract `zip_path` into `out_dir` member by member with size caps.
+
+    Raises ValueError for oversized members/archives and for member paths that
+    would land outside `out_dir` (absolute, `..`, drive-qualified), before
+    anything of that member is written.
+    """
+    root = os.path.realpath(out_dir)
+    total = 0
+    with zipfile.ZipFile(zip_path, "r") as z:
+        for zi in z.infolist():
+            dst = os.path.realpath(os.path.join(root, zi.filename))
+            # "C:x.py" is drive-relative on Windows (a release target): reject it on every platform
+            if ntpath.splitdrive(zi.filename)[0] or os.path.commonpath([root, dst]) != root:
+                raise ValueError(f"unsafe path in zip: {zi.filename}")
+            if zi.is_dir():
+                os.makedirs(dst, exist_ok=True)
+                continue
+            if zi.file_size > ZIP_MAX_FILE_BYTES:
+                raise ValueError(f"zip member too large: {zi.filename}")
+            total += zi.file_size
+            if total > ZIP_MAX_TOTAL_BYTES:
+                raise ValueError("zip contents too large")
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            # ZipExtFile stops at the declared file_size, so the caps above hold
+            with z.open(zi) as src, open(dst, "wb") as dst_f:
+                shutil.copyfileobj(src, dst_f, 1 << 20)
+
+
+ALGO_INDEX = os.path.join(ALGO_DIR, "index.jsonl")
+_algo_index_cache: tuple[tuple[int, int], Dict[str, dict]] | None = None
+
+
+def _append_algo_index(meta: dict) -> None:
+    # One write() per record: O_APPEND keeps concurrent single-line appends whole
+    if not os.path.exists(ALGO_INDEX):
+        _backfill_algo_index()  # also picks up `meta`, whose meta.json is already on disk
+        return
+    line = json.dumps(meta, separators=(",", ":")) + "\n"
+    with open(ALGO_INDEX, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def _backfill_algo_index() -> None:
+    """Seed index.jsonl from per-algorithm meta.json files (stores predating the index)."""
+    metas = []
+    for aid in os.listdir(ALGO_DIR):
+        p = os.path.join(ALGO_DIR, aid, "meta.json")
+        if os.path.isfile(p):
+            with open(p, "r", encoding="utf-8") as f:
+                metas.append(json.load(f))
+    metas.sort(key=lambda m: m.get("id", ""))
+    with open(ALGO_INDEX, "a", encoding="utf-8") as f:
+        f.writelines(json.dumps(m, separators=(",", ":")) + "\n" for m in metas)
+
+
+def _algo_index() -> Dict[str, dict]:
+    """Return {id: meta} in upload order, re-reading index.jsonl only when it changed."""
+    global _algo_index_cache
+    try:
+        st = os.stat(ALGO_INDEX)
+    except FileNotFoundError:
+        _backfill_algo_index()
+        st = os.stat(ALGO_INDEX)
+    key = (st.st_mtime_ns, st.st_size)
+    if _algo_index_cache and _algo_index_cache[0] == key:
+        return _algo_index_cache[1]
+
+    index: Dict[str, dict] = {}
+    with open(ALGO_INDEX, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            meta = json.loads(line)
+            # last occurrence wins, and moves to the end (most recent)
+            index.pop(meta["id"], None)
+            index[meta["id"]] = meta
+    _algo_index_cache = (key, index)
+    return index
+
+
 def _load_meta(aid: str) -> dict | None:
-    p = os.path.join(ALGO_DIR, aid, "meta.json")
-    if os.path.isfile(p):
-        with open(p, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return None
+    return _algo_index().get(aid)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_module(module_path: str, mtime: float):
+    """Compile a custom algorithm's source once per (path, mtime)."""
+    with open(module_path, "rb") as f:
+        return compile(f.read(), module_path, "exec")
 
 
 def _import_callable(module_path: str, func_name: str):
-    """Import `func_name` from a Python source file at `module_path`."""
+    """Import `func_name` from a Python source file at `module_path`.
+
+    The compiled code is cached; the module body still runs in a fresh
+    namespace per call so module-level algorithm state never leaks between plots.
+    """
     mod_name = "custom_algo_" + os.path.basename(os.path.dirname(module_path)).replace("-", "_")
     spec = importlib.util.spec_from_file_location(mod_name, module_path)
     if not spec or not spec.loader:
         raise RuntimeError("Failed to create module spec for custom algorithm")
     mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)  # type: ignore[attr-defined]
+    exec(_compile_module(module_path, os.path.getmtime(module_path)), mod.__dict__)
     fn = getattr(mod, func_name, None)
     if not callable(fn):
         raise RuntimeError(f"Entry function '{func_name}' not found in '{module_path}'")
     return fn
 
 
+def simulate_custom(name: str, algo: AlgorithmBase, table: np.ndarray, errors: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Step a custom algorithm through `table`, writing into preallocated arrays.
+
+    A failing step is reported and recorded as action 0 / reward 0.0; the run continues.
+    """
+    iterations = table.shape[0]
+    actions = np.zeros(iterations, dtype=np.int64)
+    rewards = np.zeros(iterations, dtype=np.float64)
+    select, update = algo.select_action, algo.update  # bound once, outside the hot loop
+    for t in range(iterations):
+        try:
+            a = select()
+            r = float(table[t, a])
+            update(a, r)
+        except Exception as e:
+            print(f"[algo {name}] t={t} error: {e}", file=sys.stderr)
+            errors.append(f"[algo {name}] t={t} error: {e}")
+            continue
+        actions[t] = a
+        rewards[t] = r
+    return actions, rewards
+
+
+async def simulate_builtins(algs: Dict[str, AlgorithmBase], table: np.ndarray, errors: list[str]) -> Dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Replay `table` for every built-in algorithm concurrently; failures are reported and zero-filled.
+
+    Each algorithm runs its own kernel in a worker thread (the compiled kernels
+    release the GIL), so the event loop stays free and algorithms use separate
+    cores. The table is only read, so it is shared without copies or locks.
+    """
+    iterations = table.shape[0]
+    outcomes = await asyncio.gather(
+        *(asyncio.to_thread(algo.run_batch, table) for algo in algs.values()),
+        return_exceptions=True,
+    )
+    results: Dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    for name, out in zip(algs, outcomes):
+        if isinstance(out, Exception):
+            print(f"[algo {name}] error: {out}", file=sys.stderr)
+            errors.append(f"[algo {name}] error: {out}")
+            out = (np.zeros(iterations, dtype=np.int64), np.zeros(iterations))
+        results[name] = out
+    return results
+
+
+class ByteLRU:
+    """LRU mapping bounded by the total size of its values (bytes / ndarray `nbytes`).
+
+    Values larger than `max_entry_bytes` are not stored at all.
+    """
+    __slots__ = ("max_bytes", "max_entry_bytes", "nbytes", "_items")
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.nbytes = 0
+        self._items: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def _size(value) -> int:
+        return value.nbytes if isinstance(value, np.ndarray) else len(value)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key):
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key, value) -> bool:
+        size = self._size(value)
+        if size > self.max_entry_bytes:
+            return False
+        self.pop(key)
+        self._items[key] = value
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, old = self._items.popitem(last=False)
+            self.nbytes -= self._size(old)
+        return True
+
+    def pop(self, key):
+        value = self._items.pop(key, None)
+        if value is not None:
+            self.nbytes -= self._size(value)
+        return value
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.nbytes = 0
+
+
+# Serialized /api/plot responses of seeded, built-in-only runs (fully deterministic),
+# LRU-evicted against a total byte budget; a full-size plot body runs to several MB
+PLOT_CACHE = ByteLRU(max_bytes=64 << 20, max_entry_bytes=4 << 20)
+# Upper bound on simulated steps per plot (iterations x algorithms)
+PLOT_STEP_BUDGET = 5_000_000
+# Reward tables of seeded sessions by (session id, iterations): a pure function of
+# env + seed + iterations, kept so re-plots with other algorithms skip the sampling
+PLOT_TABLES = ByteLRU(max_bytes=64 << 20, max_entry_bytes=8 << 20)
+
+
 @app.post("/api/plot")
 async def api_plot():
     payload = await request.get_json() or {}
@@ -497,46 +1169,52 @@ async def api_plot():
     except ValidationError as e:
         return jsonify({"error": "invalid payload", "detail": json.loads(e.json())}), 400
 
-    s = PLAY.get(req.session_id)
+    # Custom ids are dynamic: look their metadata up (index file I/O) off the event loop
+    custom_metas = await asyncio.to_thread(lambda: [(aid, _load_meta(aid)) for aid in req.custom_algorithms or ()])
+    missing = [f"custom id '{aid}' not found" for aid, meta in custom_metas if not meta]
+    if missing:
+        return jsonify({"error": "invalid payload", "detail": missing}), 400
+
+    s = _touch(req.session_id)
     if not s:
         return jsonify({"error": "invalid session"}), 404
 
     # Rebuild env with the *same parameters* but a deterministic RNG
-    env_info = s.env.info()
-    n_actions = int(env_info["n_actions"])
-    env_type = env_info.get("type")
     seed = s.seed  # reuse session seed (may be None)
-
-    if env_type == "bernoulli":
-        env = BernoulliBanditEnv(n_actions, seed=seed)
-        env.p = list(env_info["p"])  # reuse probabilities
-    else:
-        env = GaussianBanditEnv(n_actions, seed=seed)
-        env.means = list(env_info["means"])
-        env.stds = list(env_info["stds"])
+    env = s.env.reseeded(seed)
+    n_actions = env.n_actions
+    env_info = orjson.Fragment(env.info_bytes())
 
     iterations = int(req.iterations or s.iterations)
+    n_algos = len(req.algorithms) + len(req.custom_algorithms or [])
+    if iterations * n_algos > PLOT_STEP_BUDGET:
+        return jsonify({"error": "budget exceeded", "limit": PLOT_STEP_BUDGET}), 400
+
+    cache_key = None
+    if seed is not None and not req.custom_algorithms:
+        cache_key = (env.info_bytes(), seed, iterations, tuple(req.algorithms))
+        body = PLOT_CACHE.get(cache_key)
+        if body is not None:
+            return app.json.body_response(body)
 
     # Build algorithm set (built-ins + custom)
     builtins: Dict[str, AlgorithmBase] = {}
     errors: list[str] = []
 
-    for key in (req.algorithms or []):
-        if key not in ALGOS:
-            errors.append(f"unknown algorithm '{key}' skipped")
-            continue
+    # Seeded plots give each built-in an independent child stream of the session seed
+    if seed is not None:
+        algo_seeds = np.random.SeedSequence(seed).spawn(len(req.algorithms))
+    else:
+        algo_seeds = [None] * len(req.algorithms)
+    for key, algo_seed in zip(req.algorithms, algo_seeds):  # keys already validated against ALGOS
         try:
-            builtins[key] = ALGOS[key](n_actions, seed=seed)
+            builtins[key] = ALGOS[key](n_actions, seed=algo_seed)
         except Exception as e:
             errors.append(f"init '{key}' failed: {e}")
 
     customs: Dict[str, AlgorithmBase] = {}
-    if req.custom_algorithms:
-        for aid in req.custom_algorithms:
-            meta = _load_meta(aid)
-            if not meta:
-                errors.append(f"custom id '{aid}' not found")
-                continue
+    if custom_metas:
+        for aid, meta in custom_metas:
             module_path = os.path.join(ALGO_DIR, aid, meta.get("module", "main.py"))
             entry_name = meta.get("entry", "run")
             try:
@@ -553,49 +1231,45 @@ async def api_plot():
 
     algs: Dict[str, AlgorithmBase] = {**builtins, **customs}
 
-    # No algos selected → consistent empty trace
+    # No algos selected → consistent empty trace (NumPy, so orjson writes it without per-element floats)
     if not algs:
-        traces = {"empty_trace": {"actions": list(range(iterations)), "rewards": [0.0] * iterations}}
+        traces = {"empty_trace": {"actions": np.arange(iterations), "rewards": np.zeros(iterations)}}
         summary = {"empty_trace": {"mean_reward": 0.0, "final_avg_reward": 0.0}}
         resp = {"env": env_info, "iterations": iterations, "traces": traces, "summary": summary}
         if errors:
             resp["warnings"] = errors
         return jsonify(resp)
 
-    # Run batch
-    traces: Dict[str, Dict[str, list]] = {name: {"rewards": [], "actions": []} for name in algs.keys()}
-    for t in range(iterations):
-        for name, algo in algs.items():
-            try:
-                a = algo.select_action()
-                r = env.step(a)
-                algo.update(a, r)
-            except Exception as e:
-                print(f"[algo {name}] t={t} error: {e}", file=sys.stderr)
-                errors.append(f"[algo {name}] t={t} error: {e}")
-                a, r = 0, 0.0
-            traces[name]["actions"].append(int(a))
-            traces[name]["rewards"].append(float(r))
+    # Run batch: every algorithm replays one shared, read-only pre-sampled reward table
+    # in its own worker thread (off the event loop); traces stay NumPy for orjson
+    table = PLOT_TABLES.get((s.id, iterations)) if seed is not None else None
+    if table is None:
+        table = env.sample_rewards(iterations)
+        table.flags.writeable = False
+        if seed is not None:
+            PLOT_TABLES.put((s.id, iterations), table)
+    builtin_results, *custom_results = await asyncio.gather(
+        simulate_builtins(builtins, table, errors),
+        *(asyncio.to_thread(simulate_custom, name, algo, table, errors) for name, algo in customs.items()),
+    )
+    results = {**builtin_results, **dict(zip(customs, custom_results))}
+    traces = {name: {"actions": actions, "rewards": rewards} for name, (actions, rewards) in results.items()}
 
     # Summary
     summary: Dict[str, dict] = {}
     for name, data_ in traces.items():
         rewards = data_["rewards"]
-        if rewards:
-            cum = 0.0
-            last_avg = 0.0
-            for i, v in enumerate(rewards, start=1):
-                cum += v
-                last_avg = cum / i
-            mean = cum / len(rewards)
-        else:
-            mean = last_avg = 0.0
-        summary[name] = {"mean_reward": mean, "final_avg_reward": last_avg}
+        # the final running average over all steps is the overall mean
+        mean = float(rewards.mean()) if rewards.size else 0.0
+        summary[name] = {"mean_reward": mean, "final_avg_reward": mean}
 
     resp = {"env": env_info, "iterations": iterations, "traces": traces, "summary": summary}
     if errors:
         resp["warnings"] = errors  # optional field: visible in Network tab
-    return jsonify(resp)
+    body = app.json.dumpb(resp)
+    if cache_key is not None and not errors:
+        PLOT_CACHE.put(cache_key, body)
+    return app.json.body_response(body)
 
 # -----------------------------------------------------------------------------
 # Custom algorithm upload API
@@ -606,35 +1280,59 @@ class CustomAlgoWrapper(AlgorithmBase):
 
     State passed to the function:
       { n_actions, t, last_action, last_reward, seed }
+    The same dict is updated in place every step (no per-step allocation);
+    entry functions should treat it as read-only.
     """
     name = "Custom"
+    __slots__ = ("_entry", "_state")
 
     def __init__(self, n_actions: int, seed: Optional[int], entry_fn):
         super().__init__(n_actions, seed)
         self._entry = entry_fn
-        self._t = 0
-        self._last_action: Optional[int] = None
-        self._last_reward: Optional[float] = None
-        self._seed = seed
+        self._state = {"n_actions": n_actions, "t": 0, "last_action": None, "last_reward": None, "seed": seed}
 
     def select_action(self) -> int:
-        state = {
-            "n_actions": self.n_actions,
-            "t": self._t,
-            "last_action": self._last_action,
-            "last_reward": self._last_reward,
-            "seed": self._seed,
-        }
         try:
-            a = int(self._entry(state))
+            a = int(self._entry(self._state))
         except Exception as e:
-            raise RuntimeError(f"Custom algorithm error at t={self._t}: {e}")
+            raise RuntimeError(f"Custom algorithm error at t={self._state['t']}: {e}")
         return max(0, min(self.n_actions - 1, a))
 
     def update(self, action: int, reward: float) -> None:
-        self._last_action = int(action)
-        self._last_reward = float(reward)
-        self._t += 1
+        state = self._state
+        state["last_action"] = int(action)
+        state["last_reward"] = float(reward)
+        state["t"] += 1
+
+
+def _resolve_upload_module(orig_path: str, out_dir: str, entry: str) -> tuple[Optional[str], str]:
+    """Extract a .zip upload (honouring an optional manifest) and locate its module.
+
+    Returns (module path relative to `out_dir` or None, entry name). A plain .py
+    upload is its own module. Raises BadZipFile / ValueError for bad archives.
+    """
+    if not orig_path.lower().endswith(".zip"):
+        return os.path.basename(orig_path), entry
+
+    _extract_zip(orig_path, out_dir)
+    module_rel: Optional[str] = None
+    # Optional manifest override
+    mpath = os.path.join(out_dir, "manifest.json")
+    if os.path.isfile(mpath):
+        try:
+            with open(mpath, "r", encoding="utf-8") as mf:
+                m = json.load(mf)
+            entry = (m.get("entry") or entry).strip()
+            module_rel = m.get("module")
+        except Exception:
+            pass
+    return module_rel or _find_main_py(out_dir), entry
+
+
+def _write_meta(out_dir: str, meta_out: dict) -> None:
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as fh:
+        json.dump(meta_out, fh)
+    _append_algo_index(meta_out)
 
 
 @app.post("/api/algorithms")
@@ -645,7 +1343,7 @@ async def api_upload_algorithm():
       - file: uploaded file (.py or .zip)
       - meta: JSON { name, language:'python', entry:'run', sha256 }
 
-    Stores under `ALGO_DIR/<id>/meta.json` and returns { id, name, language, entry, sha256 }.
+    Stores under `ALGO_DIR/<id>/meta.json`, appends to `ALGO_DIR/index.jsonl` and returns { id, name, language, entry, sha256 }.
     """
     files = await request.files
     form = await request.form
@@ -665,36 +1363,24 @@ async def api_upload_algorithm():
     out_dir = os.path.join(ALGO_DIR, aid)
     os.makedirs(out_dir, exist_ok=True)
 
-    # Save original upload
+    # Save original upload, hashing it on the way to disk
     orig_path = os.path.join(out_dir, f.filename)
-    await f.save(orig_path)  # Quart FileStorage supports await save()
+    digest = await asyncio.to_thread(save_and_sha256, f.stream, orig_path)
 
-    # Extract if zip; otherwise use the single .py as module
-    module_rel: Optional[str] = None
-    if orig_path.lower().endswith(".zip"):
-        with zipfile.ZipFile(orig_path, "r") as z:
-            z.extractall(out_dir)
-        # Optional manifest override
-        mpath = os.path.join(out_dir, "manifest.json")
-        if os.path.isfile(mpath):
-            try:
-                m = json.load(open(mpath, "r", encoding="utf-8"))
-                entry = (m.get("entry") or entry).strip()
-                module_rel = m.get("module")
-            except Exception:
-                pass
-        if not module_rel:
-            module_rel = _find_main_py(out_dir)
-    else:
-        module_rel = os.path.basename(orig_path)
+    # Extraction and directory walks block: keep them off the event loop
+    try:
+        module_rel, entry = await asyncio.to_thread(_resolve_upload_module, orig_path, out_dir, entry)
+    except (zipfile.BadZipFile, ValueError) as e:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        return jsonify({"error": f"invalid zip: {e}"}), 400
 
     if not module_rel:
         shutil.rmtree(out_dir, ignore_errors=True)
         return jsonify({"error": "No Python file found in upload"}), 400
 
-    digest = sha256_file(orig_path)
     claimed = (meta.get("sha256") or "").lower().strip()
-    if claimed and claimed != digest:
+    if claimed and not hmac.compare_digest(claimed.encode(), digest.encode()):
+        shutil.rmtree(out_dir, ignore_errors=True)
         return jsonify({"error": "sha256 mismatch", "have": digest, "want": claimed}), 400
 
     meta_out = {
@@ -705,21 +1391,18 @@ async def api_upload_algorithm():
         "module": module_rel.replace("\\", "/"),
         "sha256": digest,
     }
-    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as fh:
-        json.dump(meta_out, fh)
+    await asyncio.to_thread(_write_meta, out_dir, meta_out)
 
     return jsonify({k: meta_out[k] for k in ("id", "name", "language", "entry", "sha256")}), 201
 
 
 @app.get("/api/algorithms")
 async def api_list_algorithms():
-    items = []
-    for aid in os.listdir(ALGO_DIR):
-        meta = _load_meta(aid)
-        if meta:
-            items.append({k: meta[k] for k in ("id", "name", "language", "entry", "sha256") if k in meta})
-    # newest first (ids are UUID hex; this is approximate ordering)
-    items.sort(key=lambda m: m.get("id", ""), reverse=True)
+    # newest first: the index is append-only, so upload order is file order
+    items = [
+        {k: meta[k] for k in ("id", "name", "language", "entry", "sha256") if k in meta}
+        for meta in reversed(_algo_index().values())
+    ]
     return jsonify(items)
 
 # -----------------------------------------------------------------------------
@@ -728,4 +1411,17 @@ async def api_list_algorithms():
 
 # NOTE: Port must stay 5050 (the frontend expects it in some places)
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5050)
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    try:  # optional faster event loop (not available on Windows)
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    # Single worker on purpose: PLAY sessions live in this process's memory.
+    # /api/plot already spreads its simulations across cores via worker threads.
+    config = Config()
+    config.bind = ["0.0.0.0:5050"]
+    asyncio.run(serve(app, config))
@@ -1,4 +1,20 @@
 # Wird von pytest automatisch vor den Tests geladen.
 import sys, pathlib
 ROOT = pathlib.Path(__file__).resolve().parents[2]  # .../bandit
-sys.path.insert(0, str(ROOT))
\ No newline at end of file
+sys.path.insert(0, str(ROOT))
+
+import io
+import pytest
+from werkzeug.datastructures import FileStorage
+
+
+@pytest.fixture
+def algo_store(tmp_path, monkeypatch):
+    """Lenkt ALGO_DIR/ALGO_INDEX nach tmp_path um und liefert eine Upload-Fabrik (Bytes -> FileStorage)."""
+    import backend.app as backend_app
+    monkeypatch.setattr(backend_app, "ALGO_DIR", str(tmp_path))
+    monkeypatch.setattr(backend_app, "ALGO_INDEX", str(tmp_path / "index.jsonl"))
+
+    def upload(data: bytes, filename: str = "algo.py") -> FileStorage:
+        return FileStorage(io.BytesIO(data), filename=filename)
+    return upload
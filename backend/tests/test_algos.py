@@ -1,5 +1,8 @@
 import math
-from backend.app import Greedy, EpsilonGreedy, UCB1, ThompsonSampling
+import asyncio
+import numpy as np
+import backend.app as backend_app
+from backend.app import Greedy, EpsilonGreedy, UCB1, ThompsonSampling, BernoulliBanditEnv, simulate_builtins
 
 def test_greedy_update_and_select():
     algo = Greedy(3, seed=0)
@@ -24,6 +27,12 @@ def test_ucb1_initial_explores_each_arm_once():
     assert algo.select_action() == 1
     algo.update(1, 0.0)
     assert algo.select_action() == 2
+    # The batch kernel resumes the same untried-arm cursor across calls
+    table = BernoulliBanditEnv(5, seed=2).sample_rewards(10)
+    batched = UCB1(5, seed=0)
+    first, _ = batched.run_batch(table[:2])
+    second, _ = batched.run_batch(table[2:])
+    assert list(first) + list(second[:3]) == [0, 1, 2, 3, 4]
 
 def test_thompson_sampling_update_counters():
     algo = ThompsonSampling(2, seed=0)
@@ -35,3 +44,56 @@ def test_thompson_sampling_update_counters():
     a = algo.select_action()
     assert 0 <= a < 2
 
+
+def test_simulate_batch_keeps_state_in_sync():
+    for algo in (Greedy(4, seed=1), EpsilonGreedy(4, seed=1), UCB1(4, seed=1)):
+        env = BernoulliBanditEnv(4, seed=3)
+        actions, rewards = algo.simulate_batch(env, 200)
+        assert actions.shape == (200,) and rewards.shape == (200,)
+        assert all(0 <= a < 4 for a in actions)
+        assert algo.counts.sum() == 200
+        for a in range(4):
+            pulled = rewards[actions == a]
+            if pulled.size:
+                assert math.isclose(algo.q_values[a], pulled.mean(), rel_tol=1e-9, abs_tol=1e-12)
+
+    thompson = ThompsonSampling(4, seed=1)
+    actions, rewards = thompson.simulate_batch(BernoulliBanditEnv(4, seed=3), 200)
+    for a in range(4):
+        pulled = rewards[actions == a]
+        assert thompson.successes[a] == 1 + pulled.sum()
+        assert thompson.failures[a] == 1 + pulled.size - pulled.sum()
+
+def test_ucb1_prefers_upper_confidence_bound():
+    algo = UCB1(2, seed=0)
+    for a, r in ((0, 0.5), (1, 0.0), (0, 0.5), (0, 0.5), (0, 0.5)):
+        algo.select_action()
+        algo.update(a, r)
+    # arm 1: 0 + sqrt(2 ln 6 / 1) ≈ 1.89  >  arm 0: 0.5 + sqrt(2 ln 6 / 4) ≈ 1.45
+    assert algo.select_action() == 1
+
+def test_simulate_builtins_replays_shared_table():
+    algs = {"greedy": Greedy(3, seed=0), "ucb1": UCB1(3, seed=0), "thompson": ThompsonSampling(3, seed=0)}
+    table = BernoulliBanditEnv(3, seed=5).sample_rewards(50)
+    errors = []
+    results = asyncio.run(simulate_builtins(algs, table, errors))
+    assert errors == []
+    assert [algs[k].counts.sum() for k in ("greedy", "ucb1")] == [50, 50]
+    for actions, rewards in results.values():
+        assert (rewards == table[range(50), actions]).all()
+
+def test_greedy_breaks_ties_randomly():
+    algo = Greedy(3, seed=0)
+    picks = {algo.select_action() for _ in range(50)}
+    assert picks == {0, 1, 2}
+
+def test_run_batch_without_numba_uses_instance_generator(monkeypatch):
+    monkeypatch.setattr(backend_app, "HAVE_NUMBA", False)
+    table = BernoulliBanditEnv(4, seed=3).sample_rewards(100)
+    global_state = np.random.get_state()[1].copy()
+    for cls in (Greedy, EpsilonGreedy, UCB1, ThompsonSampling):
+        a1, r1 = cls(4, seed=7).run_batch(table)
+        a2, r2 = cls(4, seed=7).run_batch(table)
+        assert (a1 == a2).all() and (r1 == r2).all()
+        assert (r1 == table[range(100), a1]).all()
+    assert (np.random.get_state()[1] == global_state).all()
@@ -1,4 +1,5 @@
 import pytest
+import backend.app as backend_app
 from backend.app import app  # dein Quart-App-Objekt
 
 @pytest.mark.asyncio
@@ -11,6 +12,20 @@ async def test_health_ok():
     assert data["service"] == "epic-k-armed-bandit"
     assert "version" in data  # 1 laut Code
 
+@pytest.mark.asyncio
+async def test_json_provider_handles_numpy():
+    import json
+    import numpy as np
+    async with app.app_context():
+        assert json.loads(app.json.dumps({"a": np.arange(2)})) == {"a": [0, 1]}
+        assert app.json.loads(b'{"a": [0, 1]}') == {"a": [0, 1]}
+        resp = app.json.response(a=np.zeros(2), b=1)
+        assert json.loads(await resp.get_data()) == {"a": [0.0, 0.0], "b": 1}
+        assert json.loads(await app.json.response(1, 2).get_data()) == [1, 2]
+        cached = app.json.body_response(app.json.dumpb({"a": np.arange(2)}))
+        assert cached.mimetype == "application/json"
+        assert json.loads(await cached.get_data()) == {"a": [0, 1]}
+
 @pytest.mark.asyncio
 async def test_play_start_and_step_bernoulli_happy_path():
     client = app.test_client()
@@ -52,6 +67,13 @@ async def test_play_start_and_step_bernoulli_happy_path():
 
     assert done is True  # nach iterations Durchläufen
 
+@pytest.mark.asyncio
+async def test_play_start_rejects_negative_seed_400():
+    client = app.test_client()
+    resp = await client.post("/api/play/start", json={"env": "bernoulli", "n_actions": 2, "iterations": 3, "seed": -1})
+    assert resp.status_code == 400
+    assert (await resp.get_json())["error"] == "invalid payload"
+
 @pytest.mark.asyncio
 async def test_play_step_invalid_session_404():
     client = app.test_client()
@@ -74,3 +96,281 @@ async def test_play_step_action_out_of_range_400():
     assert bad.status_code == 400
     data = await bad.get_json()
     assert data.get("error") == "action out of range"
+
+@pytest.mark.asyncio
+async def test_plot_builtin_algorithms_shapes():
+    client = app.test_client()
+
+    start = await client.post("/api/play/start", json={"env": "bernoulli", "n_actions": 3, "iterations": 20, "seed": 1})
+    sid = (await start.get_json())["session_id"]
+
+    resp = await client.post("/api/plot", json={"session_id": sid, "algorithms": ["greedy", "ucb1", "thompson"]})
+    assert resp.status_code == 200
+    data = await resp.get_json()
+    assert data["iterations"] == 20
+    assert set(data["traces"]) == {"greedy", "ucb1", "thompson"}
+    for name, trace in data["traces"].items():
+        assert len(trace["actions"]) == 20 and len(trace["rewards"]) == 20
+        assert all(0 <= a < 3 for a in trace["actions"])
+        assert set(trace["rewards"]).issubset({0.0, 1.0})
+        assert name in data["summary"]
+    assert "warnings" not in data
+
+def test_extract_zip_rejects_path_traversal(tmp_path):
+    import zipfile
+    from backend.app import _extract_zip
+
+    good = tmp_path / "good.zip"
+    with zipfile.ZipFile(good, "w") as z:
+        z.writestr("pkg/main.py", "def run(state):\n    return 0\n")
+    out = tmp_path / "good"
+    out.mkdir()
+    _extract_zip(str(good), str(out))
+    assert (out / "pkg" / "main.py").is_file()
+
+    bad = tmp_path / "bad.zip"
+    with zipfile.ZipFile(bad, "w") as z:
+        z.writestr("../evil.py", "x = 1\n")
+    with pytest.raises(ValueError):
+        _extract_zip(str(bad), str(tmp_path / "bad"))
+    assert not (tmp_path / "evil.py").exists()
+
+    for member in ("C:evil.py", "/abs/evil.py", "pkg/../../evil.py"):
+        drive = tmp_path / "drive.zip"
+        with zipfile.ZipFile(drive, "w") as z:
+            z.writestr(member, "x = 1\n")
+        with pytest.raises(ValueError):
+            _extract_zip(str(drive), str(out))
+
+@pytest.mark.asyncio
+async def test_play_sessions_expire_in_lru_order():
+    from backend.app import PLAY, PLAY_TTL, _gc, _touch
+    client = app.test_client()
+    sids = []
+    for _ in range(3):
+        start = await client.post("/api/play/start", json={"env": "bernoulli", "n_actions": 2, "iterations": 1})
+        sids.append((await start.get_json())["session_id"])
+
+    now = PLAY[sids[-1]].last_access
+    for s in PLAY.values():
+        s.last_access = now - PLAY_TTL - 1
+    _touch(sids[0])  # most recently used again
+    _gc(now + 1)
+    assert list(PLAY) == [sids[0]]
+
+@pytest.mark.asyncio
+async def test_play_log_can_skip_env_payload():
+    client = app.test_client()
+    start = await client.post("/api/play/start", json={"env": "gaussian", "n_actions": 3, "iterations": 2, "seed": 3})
+    sid = (await start.get_json())["session_id"]
+
+    full = await (await client.get(f"/api/play/log?session_id={sid}")).get_json()
+    assert full["env"]["type"] == "gaussian"
+
+    lean = await (await client.get(f"/api/play/log?session_id={sid}&include_env=0")).get_json()
+    assert lean["env"] is None
+    assert lean["t"] == full["t"] and lean["history"] == full["history"]
+
+@pytest.mark.asyncio
+async def test_plot_rejects_unknown_algorithms_400():
+    client = app.test_client()
+    start = await client.post("/api/play/start", json={"env": "bernoulli", "n_actions": 2, "iterations": 3})
+    sid = (await start.get_json())["session_id"]
+
+    bad = await client.post("/api/plot", json={"session_id": sid, "algorithms": ["nope"]})
+    assert bad.status_code == 400
+    bad = await client.post("/api/plot", json={"session_id": sid, "custom_algorithms": ["does-not-exist"]})
+    assert bad.status_code == 400
+    assert (await bad.get_json())["error"] == "invalid payload"
+
+@pytest.mark.asyncio
+async def test_plot_without_algorithms_returns_empty_trace():
+    client = app.test_client()
+    start = await client.post("/api/play/start", json={"env": "gaussian", "n_actions": 2, "iterations": 5})
+    sid = (await start.get_json())["session_id"]
+
+    data = await (await client.post("/api/plot", json={"session_id": sid})).get_json()
+    assert data["traces"]["empty_trace"] == {"actions": [0, 1, 2, 3, 4], "rewards": [0.0] * 5}
+    assert data["summary"]["empty_trace"]["mean_reward"] == 0.0
+
+@pytest.mark.asyncio
+async def test_static_assets_revalidate_with_etag(tmp_path, monkeypatch):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "main.js").write_text("console.log(1)\n")
+    (tmp_path / "index.html").write_text("<html></html>")
+    monkeypatch.setattr(backend_app, "IS_DEV", False)
+    monkeypatch.setattr(backend_app, "FRONTEND_DIR", str(tmp_path))
+    monkeypatch.setattr(backend_app, "STATIC_ETAGS", backend_app.index_static_etags(str(tmp_path)))
+    monkeypatch.setattr(backend_app, "STATIC_GZIP", {})
+    client = app.test_client()
+
+    first = await client.get("/assets/main.js")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.strip('"') == backend_app.STATIC_ETAGS["assets/main.js"]
+
+    again = await client.get("/assets/main.js", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert "immutable" in again.headers["Cache-Control"]
+
+@pytest.mark.asyncio
+async def test_uploaded_algorithms_listed_from_index(tmp_path, algo_store):
+    client = app.test_client()
+
+    ids = []
+    for name in ("first", "second"):
+        upload = algo_store(b"def run(state):\n    return 0\n")
+        resp = await client.post("/api/algorithms", files={"file": upload}, form={"meta": f'{{"name": "{name}"}}'})
+        assert resp.status_code == 201
+        ids.append((await resp.get_json())["id"])
+
+    listed = await (await client.get("/api/algorithms")).get_json()
+    assert [m["id"] for m in listed] == ids[::-1]
+    assert (tmp_path / "index.jsonl").read_text().count("\n") == 2
+
+@pytest.mark.asyncio
+async def test_upload_checks_claimed_sha256(tmp_path, algo_store):
+    import hashlib
+    client = app.test_client()
+    src = b"def run(state):\n    return 0\n"
+    digest = hashlib.sha256(src).hexdigest()
+
+    upload = algo_store(src)
+    resp = await client.post("/api/algorithms", files={"file": upload}, form={"meta": f'{{"sha256": "{digest.upper()}"}}'})
+    assert resp.status_code == 201
+    data = await resp.get_json()
+    assert data["sha256"] == digest
+    assert (tmp_path / data["id"] / "algo.py").read_bytes() == src
+
+    upload = algo_store(src)
+    resp = await client.post("/api/algorithms", files={"file": upload}, form={"meta": '{"sha256": "00"}'})
+    assert resp.status_code == 400
+
+@pytest.mark.asyncio
+async def test_plot_custom_algorithm_replays_shared_table(algo_store):
+    client = app.test_client()
+
+    upload = algo_store(b"def run(state):\n    return 1\n", "always_one.py")
+    resp = await client.post("/api/algorithms", files={"file": upload}, form={"meta": '{"name": "one"}'})
+    aid = (await resp.get_json())["id"]
+    start = await client.post("/api/play/start", json={"env": "bernoulli", "n_actions": 2, "iterations": 30, "seed": 5})
+    sid = (await start.get_json())["session_id"]
+
+    resp = await client.post("/api/plot", json={"session_id": sid, "custom_algorithms": [aid]})
+    assert resp.status_code == 200
+    trace = (await resp.get_json())["traces"]["custom:one"]
+    assert trace["actions"] == [1] * 30
+    assert len(trace["rewards"]) == 30
+
+@pytest.mark.asyncio
+async def test_plot_is_reproducible_for_seeded_sessions():
+    client = app.test_client()
+    start = await client.post("/api/play/start", json={"env": "gaussian", "n_actions": 4, "iterations": 40, "seed": 11})
+    sid = (await start.get_json())["session_id"]
+    body = {"session_id": sid, "algorithms": ["epsilon_greedy", "thompson"]}
+
+    from backend.app import PLOT_CACHE, PLOT_TABLES
+    first = await (await client.post("/api/plot", json=body)).get_json()
+    assert len(PLOT_CACHE) >= 1
+    assert PLOT_TABLES.get((sid, 40)).shape == (40, 4)
+    cached = await (await client.post("/api/plot", json=body)).get_json()
+    PLOT_CACHE.clear()
+    recomputed = await (await client.post("/api/plot", json=body)).get_json()
+    PLOT_CACHE.clear()
+    PLOT_TABLES.pop((sid, 40))
+    resampled = await (await client.post("/api/plot", json=body)).get_json()
+    assert first["traces"] == cached["traces"] == recomputed["traces"] == resampled["traces"]
+
+@pytest.mark.asyncio
+async def test_kernel_warm_up_failure_is_reported(monkeypatch, capsys):
+    import asyncio
+    def broken():
+        raise RuntimeError("no compiler")
+    monkeypatch.setattr(backend_app, "warm_kernels", broken)
+    monkeypatch.setenv("BANDIT_NUMBA_WARMUP", "1")
+
+    async with app.test_app():
+        task = app.config["KERNEL_WARMUP_TASK"]
+        await asyncio.gather(task, return_exceptions=True)
+    assert "KERNEL_WARMUP_TASK" not in app.config
+    assert "no compiler" in capsys.readouterr().err
+
+def test_plot_cache_evicts_by_bytes():
+    from backend.app import ByteLRU
+    cache = ByteLRU(max_bytes=10, max_entry_bytes=6)
+    assert cache.put("a", b"xxxx") and cache.put("b", b"yyyy")
+    assert cache.get("a") == b"xxxx"  # "a" is now most recently used
+    assert cache.put("c", b"zzzz")
+    assert cache.get("b") is None and cache.nbytes == 8
+    assert not cache.put("big", b"0123456")
+    assert len(cache) == 2
+
+@pytest.mark.asyncio
+async def test_static_assets_served_pre_gzipped(tmp_path, monkeypatch):
+    import gzip
+    body = "export const x = 1;\n" * 200
+    (tmp_path / "app.js").write_text(body)
+    etags = backend_app.index_static_etags(str(tmp_path))
+    monkeypatch.setattr(backend_app, "IS_DEV", False)
+    monkeypatch.setattr(backend_app, "FRONTEND_DIR", str(tmp_path))
+    monkeypatch.setattr(backend_app, "STATIC_ETAGS", etags)
+    monkeypatch.setattr(backend_app, "STATIC_GZIP", backend_app.precompress_static(str(tmp_path), etags))
+    client = app.test_client()
+
+    packed = await client.get("/app.js", headers={"Accept-Encoding": "gzip, deflate"})
+    assert packed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(await packed.get_data()).decode() == body
+
+    plain = await client.get("/app.js")
+    assert "Content-Encoding" not in plain.headers
+    assert (await plain.get_data(as_text=True)) == body
+    assert plain.headers["ETag"] != packed.headers["ETag"]
+
+@pytest.mark.asyncio
+async def test_play_log_history_rows_and_columns():
+    client = app.test_client()
+    start = await client.post("/api/play/start", json={"env": "bernoulli", "n_actions": 3, "iterations": 5, "seed": 1})
+    sid = (await start.get_json())["session_id"]
+    steps = [await (await client.post("/api/play/step", json={"session_id": sid, "action": a})).get_json() for a in (2, 0, 1)]
+
+    rows = (await (await client.get(f"/api/play/log?session_id={sid}")).get_json())["history"]
+    assert rows == [{k: st[k] for k in ("t", "action", "reward", "accepted")} for st in steps]
+
+    cols = (await (await client.get(f"/api/play/log?session_id={sid}&format=columns")).get_json())["history"]
+    assert cols["t"] == [1, 2, 3] and cols["action"] == [2, 0, 1]
+    assert cols["reward"] == [st["reward"] for st in steps]
+    assert cols["accepted"] == [st["accepted"] for st in steps]
+
+    await client.post("/api/play/reset", json={"session_id": sid})
+    assert (await (await client.get(f"/api/play/log?session_id={sid}")).get_json())["history"] == []
+
+@pytest.mark.asyncio
+async def test_upload_zip_resolves_manifest_module(algo_store):
+    import io, json, zipfile
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("manifest.json", json.dumps({"module": "algos/pick.py", "entry": "choose"}))
+        z.writestr("algos/pick.py", "def choose(state):\n    return 0\n")
+    client = app.test_client()
+
+    upload = algo_store(buf.getvalue(), "pick.zip")
+    resp = await client.post("/api/algorithms", files={"file": upload}, form={"meta": "{}"})
+    assert resp.status_code == 201
+    data = await resp.get_json()
+    assert data["entry"] == "choose"
+    assert backend_app._load_meta(data["id"])["module"] == "algos/pick.py"
+
+@pytest.mark.asyncio
+async def test_plot_enforces_iteration_and_step_budget(monkeypatch):
+    client = app.test_client()
+    start = await client.post("/api/play/start", json={"env": "bernoulli", "n_actions": 2, "iterations": 10})
+    sid = (await start.get_json())["session_id"]
+
+    too_long = await client.post("/api/plot", json={"session_id": sid, "algorithms": ["greedy"], "iterations": 50_001})
+    assert too_long.status_code == 400
+
+    monkeypatch.setattr(backend_app, "PLOT_STEP_BUDGET", 15)
+    over = await client.post("/api/plot", json={"session_id": sid, "algorithms": ["greedy", "ucb1"]})
+    assert over.status_code == 400
+    assert (await over.get_json())["error"] == "budget exceeded"
@@ -1,3 +1,4 @@
+import numpy as np
 from backend.app import BernoulliBanditEnv, GaussianBanditEnv, make_env
 
 # test bandit environment classes
@@ -18,6 +19,9 @@ def test_bernoulli_env_step_and_info():
     assert len(env.p) == 4
     vals = [env.step(0) for _ in range(20)]
     assert set(vals).issubset({0.0, 1.0})
+    batch = env.step_batch(0, 20)
+    assert batch.shape == (20,) and batch.dtype == np.float64
+    assert set(batch.tolist()).issubset({0.0, 1.0})
     info = env.info()
     assert info["type"] == "bernoulli"
     assert len(info["p"]) == 4
@@ -30,7 +34,23 @@ def test_gaussian_env_step_and_info():
     env = GaussianBanditEnv(n_actions=3, seed=42)
     vals = [env.step(2) for _ in range(10)]
     assert all(isinstance(v, float) for v in vals)
+    batch = env.step_batch(2, 10_000)
+    assert batch.shape == (10_000,)
+    assert abs(batch.mean() - env.means[2]) < 5 * env.stds[2] / 100
     info = env.info()
     assert info["type"] == "gaussian"
     assert len(info["means"]) == 3 and len(info["stds"]) == 3
     assert info["n_actions"] == 3
+
+def test_env_info_bytes_cached_and_reseeded_shares_params():
+    """
+    Test serialized info matches info() and reseeded envs keep parameters
+    """
+    import json
+    env = GaussianBanditEnv(n_actions=3, seed=7)
+    assert json.loads(env.info_bytes()) == env.info()
+    assert not env.means.flags.writeable
+
+    clone = env.reseeded(1)
+    assert clone.means is env.means and clone.stds is env.stds
+    assert clone.info_bytes() == env.info_bytes()
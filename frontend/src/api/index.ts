@@ -1,5 +1,5 @@
 import type {
-  PlayEndRequest, PlayEndResponse, PlayLogResponse, PlayResetRequest, PlayResetResponse, 
+  PlayEndRequest, PlayEndResponse, PlayLogResponse, PlayLogLeanResponse, PlayResetRequest, PlayResetResponse, 
   PlayStartRequest, PlayStartResponse, PlayStepResponse, PlotFromSessionRequest, 
   RunResponse, UploadedAlgorithm
 } from '@/types'
@@ -84,6 +84,16 @@ export async function playLog(session_id: string): Promise<PlayLogResponse> {
   }
 }
 
+/** Fetch iteration budget and history only, for re-syncs that already hold the env. */
+export async function playHistory(session_id: string): Promise<PlayLogLeanResponse> {
+  try {
+    const q = new URLSearchParams({ session_id, include_env: "0" }).toString();
+    return await request<PlayLogLeanResponse>(`/api/play/log?${q}`);
+  } catch (e) {
+    throw e
+  }
+}
+
 /** Gracefully end a session (server may finalize stats/cleanup). */
 export async function playEnd(session_id: string): Promise<PlayEndResponse> {
   try {
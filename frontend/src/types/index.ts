@@ -100,6 +100,8 @@ export interface PlayLogResponse {
   history: PlayLogHistoryItem[];
   env: EnvInfo;
 }
+/** `/api/play/log?include_env=0`: same payload without the env block. */
+export type PlayLogLeanResponse = Omit<PlayLogResponse, "env"> & { env: null };
 
 export interface PlayEndRequest { session_id: string }
 export interface PlayEndResponse { ok: boolean }
@@ -1,7 +1,7 @@
 // src/ui/ManualPlay.tsx
 import { useEffect, useMemo, useRef, useState } from "react";
 import type { EnvInfo, PlayCtx } from "@/types";
-import { playLog, playReset, playStep } from "@/api";
+import { playHistory, playLog, playReset, playStep } from "@/api";
 import { scrollTo } from "@/utils/nav";
 import { useTranslation } from "react-i18next";
 
@@ -171,7 +171,7 @@ export default function ManualPlay({
     try {
       setLoading(true);
       await playReset(sessionId);
-      const info = await playLog(sessionId);
+      const info = await playHistory(sessionId);
 
       setIterations(info.iterations);
       setTstep(Math.max(1, info.t + 1));
@@ -4,19 +4,24 @@ Run tests in a self-managed virtualenv:
 - Creates .venv if missing
 - Installs backend/requirements.txt
 - Ensures pytest is installed
-- Runs pytest with any args you pass (e.g. `python run_tests.py backend/tests/test_algos.py`)
+- Does all installs in one pip call, skipped while requirements.txt matches the hash in .venv/.reqs.sha256
+- `--refresh` forces the step-by-step install (pip, requirements, pytest) even when up to date
+- Runs pytest with any other args you pass (e.g. `python run_tests.py backend/tests/test_algos.py`);
+  without args it uses lean defaults (importlib import mode, no cache provider)
 """
 
 import os
 import sys
 import subprocess
 import shutil
+import hashlib
 import platform
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
 VENV_DIR = ROOT / ".venv"
 REQS = ROOT / "backend" / "requirements.txt"
+DEPS_OK = VENV_DIR / ".reqs.sha256"  # hash of REQS at the last successful install
 
 IS_WINDOWS = platform.system().lower().startswith("win")
 VENV_PY = VENV_DIR / ("Scripts/python.exe" if IS_WINDOWS else "bin/python")
@@ -36,6 +41,13 @@ def ensure_venv():
     step("Creating virtualenv (.venv)")
     run([sys.executable, "-m", "venv", str(VENV_DIR)])
 
+def reqs_hash():
+    return hashlib.sha256(REQS.read_bytes() if REQS.exists() else b"").hexdigest()
+
+def deps_fresh():
+    # content hash, not mtime: checkouts and branch switches touch files without changing them
+    return DEPS_OK.exists() and DEPS_OK.read_text().strip() == reqs_hash()
+
 def ensure_pip():
     step("Upgrading pip/setuptools/wheel")
     run(VENV_PIP + ["install", "--upgrade", "pip", "setuptools", "wheel"])
@@ -49,22 +61,29 @@ def ensure_requirements():
 
 def ensure_pytest():
     step("Ensuring pytest is installed")
+    # one interpreter start checks both; async tests need pytest-asyncio
+    probe = ("import importlib.util, sys; "
+             "sys.exit(0 if importlib.util.find_spec('pytest') and importlib.util.find_spec('pytest_asyncio') else 1)")
     try:
-        run([str(VENV_PY), "-c", "import pytest; print(pytest.__version__)"])
+        run([str(VENV_PY), "-c", probe])
     except subprocess.CalledProcessError:
-        run(VENV_PIP + ["install", "pytest"])
-        # async tests need pytest-asyncio; install if missing
-        try:
-            run([str(VENV_PY), "-c", "import pytest_asyncio"])
-        except subprocess.CalledProcessError:
-            run(VENV_PIP + ["install", "pytest-asyncio"])
-
-def run_pytest():
+        run(VENV_PIP + ["install", "pytest", "pytest-asyncio"])
+
+def install_all():
+    # one pip start (and one resolve) for tooling, test deps and requirements
+    step("Installing pip tooling, pytest and backend dependencies")
+    cmd = VENV_PIP + ["install", "--upgrade", "pip", "setuptools", "wheel", "pytest", "pytest-asyncio"]
+    if REQS.exists():
+        cmd += ["-r", str(REQS)]
+    run(cmd)
+
+def run_pytest(args):
     step("Running pytest")
     # Alles, was du an run_tests.py anhängst, wird an pytest durchgereicht:
     #   python run_tests.py backend/tests/test_algos.py -k greedy -q
-    args = sys.argv[1:]
-    cmd = [str(VENV_PY), "-m", "pytest"] + (args if args else [])
+    # no args: the plain full run, minus cache writes and sys.path rewriting (conftest sets the path)
+    default_args = ["--import-mode=importlib", "-p", "no:cacheprovider", "--no-header"]
+    cmd = [str(VENV_PY), "-m", "pytest"] + (args if args else default_args)
     return subprocess.call(cmd)
 
 def main():
@@ -75,11 +94,23 @@ def main():
     print(f"Existing venv: {'yes' if VENV_PY.exists() else 'no'}")
     print(f"Currently inside a venv: {'yes' if in_venv else 'no'}")
 
+    args = sys.argv[1:]
+    refresh = "--refresh" in args
+    if refresh:
+        args = [a for a in args if a != "--refresh"]
+
     ensure_venv()
-    ensure_pip()
-    ensure_requirements()
-    ensure_pytest()
-    code = run_pytest()
+    if refresh:
+        ensure_pip()
+        ensure_requirements()
+        ensure_pytest()
+        DEPS_OK.write_text(reqs_hash())
+    elif deps_fresh():
+        step("Dependencies unchanged since last install — skipping pip")
+    else:
+        install_all()
+        DEPS_OK.write_text(reqs_hash())
+    code = run_pytest(args)
 
     if code == 0:
         print("\n✅  All tests passed!")